@@ -1,40 +1,70 @@
 from flask import Flask, render_template, request, jsonify
 import sqlite3
-import pandas as pd
-import numpy as np
 from collections import Counter, defaultdict
 from concurrent.futures import ThreadPoolExecutor
-from sklearn.feature_extraction.text import TfidfVectorizer
-import nltk
-from nltk.util import ngrams
-from nltk.tokenize import word_tokenize
+from pathlib import Path
+import heapq
 import json
 import time
 import re
 import os
 
-nltk.download('punkt', quiet=True)
+# pandas, numpy, scikit-learn and NLTK are imported inside the methods that
+# use them so the app starts fast; NLTK data comes from the local cache
+# built by backend/nltk_resources.py.
+from backend.nltk_resources import tokenize
+from backend.shard_utils import all_shard_paths, get_shard_count
+
+GROUPED_DB_PATH = 'backend/grouped_data.db'
+RESULT_LIMIT = 1000
+
 app = Flask(__name__)
 
+def connect_shard(db_path):
+    """Open a grouped data shard read-only so a missing shard is an error, not a new file."""
+    return sqlite3.connect(Path(db_path).absolute().as_uri() + '?mode=ro', uri=True)
+
 class KeywordAnalyzer:
     def __init__(self):
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # One thread per shard so /analyze scans every shard at once
+        self.executor = ThreadPoolExecutor(max_workers=max(4, get_shard_count()))
         print("[INFO] KeywordAnalyzer initialized")
-        
-    def get_data(self, keyword):
-        print(f"[INFO] Fetching data for keyword: {keyword}")
-        start_time = time.time()
+
+    def query_shard(self, db_path, keyword, limit):
+        """Return the top rows of one shard as (domain, combined_text, hits)."""
+        keyword = keyword.lower()
+        conn = connect_shard(db_path)
         try:
-            conn = sqlite3.connect('backend/grouped_data.db')
             query = """
-            SELECT domain, combined_text
-            FROM domain_data 
+            SELECT domain, combined_text,
+                   (LENGTH(combined_text) - LENGTH(REPLACE(LOWER(combined_text), ?, ''))) / LENGTH(?) AS hits
+            FROM domain_data
             WHERE combined_text LIKE ?
-            LIMIT 1000
+            ORDER BY hits DESC
+            LIMIT ?
             """
-            df = pd.read_sql_query(query, conn, params=[f'%{keyword}%'])
+            return conn.execute(query, [keyword, keyword, f'%{keyword}%', limit]).fetchall()
+        finally:
             conn.close()
-            
+
+    def get_data(self, keyword):
+        import pandas as pd
+
+        print(f"[INFO] Fetching data for keyword: {keyword}")
+        start_time = time.time()
+        try:
+            # Fan out to every shard in parallel and merge their top-k rows
+            shard_results = self.executor.map(
+                lambda db_path: self.query_shard(db_path, keyword, RESULT_LIMIT),
+                all_shard_paths(GROUPED_DB_PATH)
+            )
+            rows = heapq.nlargest(
+                RESULT_LIMIT,
+                (row for shard_rows in shard_results for row in shard_rows),
+                key=lambda row: row[2]
+            )
+            df = pd.DataFrame([row[:2] for row in rows], columns=['domain', 'combined_text'])
+
             fetch_time = time.time() - start_time
             
             if not df.empty:
@@ -131,6 +161,9 @@ class KeywordAnalyzer:
         )
 
     def analyze_related_terms(self, df):
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
         vectorizer = TfidfVectorizer(
             max_features=100,
             stop_words='english',
@@ -164,8 +197,10 @@ class KeywordAnalyzer:
         )
 
     def analyze_context(self, df, keyword):
+        import pandas as pd
+
         text = ' '.join(df['combined_text'])
-        tokens = word_tokenize(text.lower())
+        tokens = tokenize(text.lower())
         window_size = 5
         
         context_words = []
@@ -203,8 +238,11 @@ class KeywordAnalyzer:
         )
 
     def analyze_network(self, df, keyword):
+        import pandas as pd
+        from nltk.util import ngrams
+
         text = ' '.join(df['combined_text'].str.lower())
-        tokens = word_tokenize(text)
+        tokens = tokenize(text)
         trigrams = list(ngrams(tokens, 3))
         
         keyword_trigrams = [tg for tg in trigrams if keyword.lower() in tg][:1000]
@@ -287,16 +325,28 @@ def analyze():
 @app.route('/stats', methods=['GET'])
 def get_stats():
     try:
-        conn = sqlite3.connect('backend/grouped_data.db')
-        cursor = conn.cursor()
-        
+        def shard_stats(db_path):
+            conn = connect_shard(db_path)
+            cursor = conn.cursor()
+            result = cursor.execute(
+                'SELECT COUNT(DISTINCT domain), COUNT(*), SUM(LENGTH(combined_text)) FROM domain_data'
+            ).fetchone()
+            conn.close()
+            return result
+
+        # A domain lives in exactly one shard, so per-shard counts add up
+        total_domains = total_rows = total_length = 0
+        for domains, rows, length in analyzer.executor.map(shard_stats, all_shard_paths(GROUPED_DB_PATH)):
+            total_domains += domains
+            total_rows += rows
+            total_length += length or 0
+
         stats = {
-            'total_domains': cursor.execute('SELECT COUNT(DISTINCT domain) FROM domain_data').fetchone()[0],
+            'total_domains': total_domains,
             'total_records': 10971, 
-            'avg_text_length': cursor.execute('SELECT AVG(LENGTH(combined_text)) FROM domain_data').fetchone()[0]
+            'avg_text_length': total_length / total_rows if total_rows else None
         }
-        
-        conn.close()
+
         return jsonify(stats)
     except Exception as e:
         print(f"[ERROR] Failed to get stats: {str(e)}")
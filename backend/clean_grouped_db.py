@@ -1,30 +1,35 @@
 import sqlite3
 import re
-from nltk.corpus import stopwords
-import nltk
+import sys
+from functools import lru_cache
 
-nltk.download('stopwords')
-stop_words = set(stopwords.words('english'))
+from db_utils import GROUPED_DB_PATH
+from nltk_resources import get_stop_words
+from shard_utils import shard_path, shards_from_args
 
 # Additional stop words
 custom_stop_words = {'us', 'www', 'com', 'html', 'htm', 'php', 'contact', 'home', 'index', 'about', 'service'}
-all_stop_words = stop_words.union(custom_stop_words)
+
+@lru_cache(maxsize=1)
+def get_all_stop_words():
+    return get_stop_words().union(custom_stop_words)
+
+def clean_combined_text(text):
+    all_stop_words = get_all_stop_words()
+    # Remove non-alphabetical characters and short words
+    cleaned_text = ' '.join([word for word in re.sub(r'[^a-zA-Z ]', ' ', text).split() if len(word) > 2])
+    # Remove stopwords
+    cleaned_text = ' '.join([word for word in cleaned_text.split() if word.lower() not in all_stop_words])
+    return cleaned_text
 
 # Function to clean grouped database
-def clean_grouped_db():
-    conn = sqlite3.connect('backend/grouped_data.db')
+def clean_grouped_db(shard=0):
+    conn = sqlite3.connect(shard_path(GROUPED_DB_PATH, shard))
     cursor = conn.cursor()
     cursor.execute('SELECT domain, combined_text FROM domain_data')
     rows = cursor.fetchall()
 
-    cleaned_data = []
-
-    for domain, text in rows:
-        # Remove non-alphabetical characters and short words
-        cleaned_text = ' '.join([word for word in re.sub(r'[^a-zA-Z ]', ' ', text).split() if len(word) > 2])
-        # Remove stopwords
-        cleaned_text = ' '.join([word for word in cleaned_text.split() if word.lower() not in all_stop_words])
-        cleaned_data.append((domain, cleaned_text))
+    cleaned_data = [(domain, clean_combined_text(text)) for domain, text in rows]
 
     cursor.execute('DELETE FROM domain_data')
     cursor.executemany('INSERT INTO domain_data (domain, combined_text) VALUES (?, ?)', cleaned_data)
@@ -32,5 +37,7 @@ def clean_grouped_db():
     conn.close()
 
 if __name__ == "__main__":
-    clean_grouped_db()
+    # Pass a shard index to clean one shard, e.g. one process per shard
+    for shard in shards_from_args(sys.argv):
+        clean_grouped_db(shard)
     print("Grouped database cleaned and optimized.")
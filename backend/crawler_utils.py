@@ -1,6 +1,8 @@
 import requests
+import urllib3
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
+import codecs
 import re
 import threading
 from concurrent.futures import ThreadPoolExecutor
@@ -16,6 +18,17 @@ HEADERS = {
     )
 }
 
+# Streaming fetch limits: pages are read in chunks and parsing stops at
+# MAX_PAGE_BYTES, so a huge page or binary file cannot pin a worker's memory.
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+# Record skipped non-HTML or oversized resources in inaccessible_sites
+LOG_SKIPPED_RESOURCES = False
+
+class SkippedResource(Exception):
+    """Raised when a URL points to a non-HTML or oversized resource."""
+
 # Dictionary to hold locks per domain
 domain_locks = {}
 domain_locks_lock = threading.Lock()
@@ -47,29 +60,193 @@ def force_protocol(url):
     if not url.startswith(('http://', 'https://')):
         url = 'http://' + url
     try:
-        response = requests.get(url, timeout=5)
-        if response.status_code != 200:
+        # Only the status line is needed, so do not download the body
+        with requests.get(url, timeout=5, stream=True) as response:
+            status_code = response.status_code
+        if status_code != 200:
             url = re.sub(r'^http://', 'https://', url, count=1)
     except requests.exceptions.RequestException:
         url = re.sub(r'^http://', 'https://', url, count=1)
     return url
 
-def scrape_text(url, session):
-    """Scrape the text content from the given URL."""
-    try:
-        response = session.get(url, timeout=10)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            text = soup.get_text(separator=' ', strip=True)
+def parse_content_type(header):
+    """Split a Content-Type header into its lowercased media type and charset."""
+    media_type, _, params = header.partition(';')
+    match = re.search(r'charset=["\']?([\w.:-]+)', params, re.IGNORECASE)
+    return media_type.strip().lower(), match.group(1) if match else None
+
+def _set_read_timeout(response, seconds):
+    """Limit the next socket read of a streamed response to the given seconds."""
+    connection = getattr(response.raw, 'connection', None)
+    sock = getattr(connection, 'sock', None)
+    if sock is None:
+        # http.client detaches the socket from the connection when the server
+        # closes after this response; the response's file object still has it
+        fp = getattr(getattr(response.raw, '_fp', None), 'fp', None)
+        sock = getattr(getattr(fp, 'raw', None), '_sock', None)
+    if sock is not None:
+        sock.settimeout(seconds)
+
+def iter_body(response, deadline, chunk_size=CHUNK_SIZE):
+    """
+    Yield the decoded response body as it arrives, until the deadline.
+
+    Every socket read is limited to the time left before the deadline, and
+    read1() returns after a single socket read instead of waiting for a full
+    chunk, so a slow-drip server cannot hold the caller past the deadline.
+    Falls back to iter_content() on urllib3 versions without read1().
+    """
+    read1 = getattr(response.raw, 'read1', None)
+    content = response.iter_content(chunk_size) if read1 is None else None
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout("Exceeded total download time")
+        _set_read_timeout(response, remaining)
+        try:
+            chunk = next(content, b'') if read1 is None else read1(chunk_size, decode_content=True)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        if not chunk:
+            return
+        yield chunk
+
+def fetch_soup(url, session, timeout=10, max_bytes=None):
+    """
+    Stream an HTML page and parse at most max_bytes of it.
+
+    Content-Type and Content-Length are checked before any of the body is
+    read, and timeout bounds the whole download: connecting and reading the
+    headers share one urllib3 total timeout, and every body read only gets
+    the time left after that.
+
+    Args:
+        url (str): The URL to fetch.
+        session (requests.Session): Session used for the request.
+        timeout (int): Total seconds allowed for the request and body.
+        max_bytes (int): Maximum number of body bytes to read and parse
+            (default: MAX_PAGE_BYTES, read at call time).
+
+    Returns:
+        BeautifulSoup: The parsed page, truncated at max_bytes.
+
+    Raises:
+        SkippedResource: The resource is not HTML or is larger than max_bytes.
+        requests.exceptions.RequestException: The request failed, returned a
+            non-200 status or exceeded the total timeout.
+    """
+    if max_bytes is None:
+        max_bytes = MAX_PAGE_BYTES
+    deadline = time.monotonic() + timeout
+    request_timeout = urllib3.util.Timeout(total=timeout)
+    with session.get(url, timeout=request_timeout, stream=True) as response:
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(f"Status Code: {response.status_code}", response=response)
+
+        content_type, charset = parse_content_type(response.headers.get('Content-Type', ''))
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            raise SkippedResource(f"Unsupported Content-Type: {content_type}")
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > max_bytes:
+            raise SkippedResource(f"Content-Length {content_length} exceeds limit of {max_bytes} bytes")
+
+        chunks = []
+        received = 0
+        truncated = False
+        try:
+            for chunk in iter_body(response, deadline):
+                chunk = chunk[:max_bytes - received]
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= max_bytes:
+                    truncated = True
+                    break
+        except requests.exceptions.Timeout as e:
+            raise requests.exceptions.Timeout(f"Exceeded total timeout of {timeout} seconds") from e
+
+    return BeautifulSoup(decode_body(chunks, charset, truncated), 'html.parser')
+
+def _trim_partial_utf8(data):
+    """Drop an incomplete UTF-8 sequence from the end of data."""
+    start = len(data) - 1
+    # Walk back over continuation bytes to the lead byte of the last sequence
+    while start >= 0 and len(data) - start < 4 and 0x80 <= data[start] < 0xC0:
+        start -= 1
+    if start < 0:
+        return data
+    lead = data[start]
+    if 0xC0 <= lead < 0xE0:
+        length = 2
+    elif 0xE0 <= lead < 0xF0:
+        length = 3
+    elif 0xF0 <= lead < 0xF8:
+        length = 4
+    else:
+        length = 1
+    return data[:start] if len(data) - start < length else data
+
+def decode_body(chunks, charset, truncated):
+    """
+    Decode streamed body chunks without garbling a character cut by the byte cap.
+
+    With a declared charset the chunks go through an incremental decoder,
+    and when the body was truncated the decoder is never finalized, so an
+    incomplete trailing sequence is dropped. Without one, a partial UTF-8
+    tail is trimmed and the bytes are returned for BeautifulSoup to decode
+    from <meta charset> or by detection.
+
+    >>> decode_body([b'caf', b'\\xc3\\xa9 cr\\xc3'], 'utf-8', truncated=True)
+    'café cr'
+    >>> decode_body([b'caf\\xc3\\xa9 cr\\xc3'], None, truncated=True)
+    b'caf\\xc3\\xa9 cr'
+    """
+    if charset:
+        try:
+            decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+        except LookupError:
+            # Unknown charset name in the header; let BeautifulSoup detect it
+            decoder = None
+        if decoder is not None:
+            text = ''.join(decoder.decode(chunk) for chunk in chunks)
+            if not truncated:
+                text += decoder.decode(b'', final=True)
             return text
+
+    data = b''.join(chunks)
+    return _trim_partial_utf8(data) if truncated else data
+
+def scrape_page(url, session, timeout=10, max_bytes=None, log_skipped=None):
+    """
+    Fetch and parse a page, logging failures; returns the soup or None.
+
+    max_bytes and log_skipped default to MAX_PAGE_BYTES and
+    LOG_SKIPPED_RESOURCES as set when the call is made, so changing those
+    module settings at runtime affects crawls already configured.
+    """
+    if log_skipped is None:
+        log_skipped = LOG_SKIPPED_RESOURCES
+    try:
+        return fetch_soup(url, session, timeout=timeout, max_bytes=max_bytes)
+    except SkippedResource as e:
+        if log_skipped:
+            save_inaccessible_site(url, str(e))
         else:
-            save_inaccessible_site(url, f"Status Code: {response.status_code}")
-            return None
+            print(f"[Skipped] {url} - Reason: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         save_inaccessible_site(url, str(e))
         return None
 
-def crawl_and_scrape(url, depth=1, max_links=20):
+def scrape_text(url, session, timeout=10, max_bytes=None, log_skipped=None):
+    """Scrape the text content from the given URL, reading at most max_bytes."""
+    soup = scrape_page(url, session, timeout=timeout, max_bytes=max_bytes, log_skipped=log_skipped)
+    if soup is None:
+        return None
+    return soup.get_text(separator=' ', strip=True)
+
+def crawl_and_scrape(url, depth=1, max_links=20, on_page=None, stop_event=None):
     """
     Crawl a single domain up to the specified depth and scrape accessible pages.
 
@@ -77,6 +254,13 @@ def crawl_and_scrape(url, depth=1, max_links=20):
         url (str): The starting URL.
         depth (int): Crawling depth.
         max_links (int): Maximum number of pages to scrape per domain.
+        on_page (callable): Optional callback invoked as on_page(url, text)
+            after each page is saved, used to stream pages to later stages.
+        stop_event (threading.Event): Optional event that ends the crawl
+            before the next page once set.
+
+    Returns:
+        str: The crawled domain.
     """
     start_time = time.time()
     initial_url = force_protocol(url)
@@ -87,7 +271,7 @@ def crawl_and_scrape(url, depth=1, max_links=20):
     try:
         if is_url_scraped(initial_url):
             print(f"[{domain}] Already scraped. Skipping: {initial_url}")
-            return
+            return domain
 
         queue = [(initial_url, 0)]
         scraped_count = 0
@@ -104,37 +288,38 @@ def crawl_and_scrape(url, depth=1, max_links=20):
             if scraped_count >= max_links:
                 print(f"[{domain}] Reached max limit of {max_links} links.")
                 break
+            if stop_event is not None and stop_event.is_set():
+                print(f"[{domain}] Stopped before: {current_url}")
+                break
 
             print(f"[{domain}] Scraping ({scraped_count + 1}/{max_links}): {current_url}")
-            text = scrape_text(current_url, session)
+            # One download per page: the same soup gives the text and the links
+            soup = scrape_page(current_url, session)
+            text = soup.get_text(separator=' ', strip=True) if soup is not None else None
 
             if text:
                 save_scraped_data(current_url, text)
                 scraped_count += 1
+                if on_page is not None:
+                    on_page(current_url, text)
 
                 if current_depth < depth:
-                    try:
-                        response = session.get(current_url, timeout=5)
-                        if response.status_code == 200:
-                            soup = BeautifulSoup(response.text, 'html.parser')
-                            anchors = soup.find_all('a', href=True)
-                            for a in anchors:
-                                href = a['href'].strip()
-                                if not href or href == " ":
-                                    continue
-                                # Resolve relative URLs
-                                child_url = urljoin(current_url, href)
-                                child_domain = get_domain(child_url)
-                                if child_domain == domain:
-                                    if child_url not in visited and not is_url_scraped(child_url):
-                                        queue.append((child_url, current_depth + 1))
-                                        if len(queue) + scraped_count >= max_links:
-                                            break
-                    except requests.exceptions.RequestException as e:
-                        save_inaccessible_site(current_url, str(e))
-                        continue
+                    anchors = soup.find_all('a', href=True)
+                    for a in anchors:
+                        href = a['href'].strip()
+                        if not href or href == " ":
+                            continue
+                        # Resolve relative URLs
+                        child_url = urljoin(current_url, href)
+                        child_domain = get_domain(child_url)
+                        if child_domain == domain:
+                            if child_url not in visited and not is_url_scraped(child_url):
+                                queue.append((child_url, current_depth + 1))
+                                if len(queue) + scraped_count >= max_links:
+                                    break
             else:
                 print(f"[{domain}] Failed to scrape: {current_url}")
+        return domain
     finally:
         # Release domain lock
         release_domain_lock(domain)
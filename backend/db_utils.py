@@ -1,23 +1,50 @@
 import sqlite3
 import os
+from urllib.parse import urlparse
+
+from shard_utils import all_shard_paths, domain_shard_path
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SCRAPED_DB_PATH = os.path.join(BASE_DIR, 'scraped_data.db')
 INACCESSIBLE_DB_PATH = os.path.join(BASE_DIR, 'inaccessible_sites.db')
+CLEANED_DB_PATH = os.path.join(BASE_DIR, 'cleaned_data.db')
+GROUPED_DB_PATH = os.path.join(BASE_DIR, 'grouped_data.db')
 
-def init_databases():
-    """Initialize the SQLite databases and create the necessary tables."""
-    # Initialize scraped data database
-    scraped_conn = sqlite3.connect(SCRAPED_DB_PATH)
-    scraped_cursor = scraped_conn.cursor()
-    scraped_cursor.execute("""
+def create_scraped_tables(conn):
+    """Create the web_content table in a scraped data shard."""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS web_content (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             url TEXT UNIQUE,
             text_content TEXT
         )
     """)
-    scraped_conn.commit()
+    conn.commit()
+
+def create_cleaned_tables(conn):
+    """Create the cleaned_data table in a cleaned data shard."""
+    conn.execute('CREATE TABLE IF NOT EXISTS cleaned_data (url TEXT, cleaned_text TEXT)')
+    conn.commit()
+
+def create_grouped_tables(conn):
+    """Create the domain_data and orchestrator checkpoint tables in a grouped data shard."""
+    conn.execute('CREATE TABLE IF NOT EXISTS domain_data (domain TEXT, combined_text TEXT)')
+    # Links whose domain has been cleaned, grouped and finalized
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_checkpoint (
+            link TEXT PRIMARY KEY,
+            domain TEXT
+        )
+    """)
+    conn.commit()
+
+def init_databases():
+    """Initialize the SQLite databases and create the necessary tables."""
+    # Initialize every scraped data shard
+    for path in all_shard_paths(SCRAPED_DB_PATH):
+        scraped_conn = sqlite3.connect(path)
+        create_scraped_tables(scraped_conn)
+        scraped_conn.close()
 
     # Initialize inaccessible sites database
     inaccessible_conn = sqlite3.connect(INACCESSIBLE_DB_PATH)
@@ -30,13 +57,27 @@ def init_databases():
         )
     """)
     inaccessible_conn.commit()
-
-    scraped_conn.close()
     inaccessible_conn.close()
 
+def init_etl_databases():
+    """Create the cleaned and grouped tables in every shard."""
+    for path in all_shard_paths(CLEANED_DB_PATH):
+        cleaned_conn = sqlite3.connect(path)
+        create_cleaned_tables(cleaned_conn)
+        cleaned_conn.close()
+
+    for path in all_shard_paths(GROUPED_DB_PATH):
+        grouped_conn = sqlite3.connect(path)
+        create_grouped_tables(grouped_conn)
+        grouped_conn.close()
+
+def _url_shard_path(db_path, url):
+    """Return the shard of a database that owns the URL's domain."""
+    return domain_shard_path(db_path, urlparse(url).netloc)
+
 def is_url_scraped(url):
     """Check if the URL has already been scraped."""
-    conn = sqlite3.connect(SCRAPED_DB_PATH)
+    conn = sqlite3.connect(_url_shard_path(SCRAPED_DB_PATH, url))
     cursor = conn.cursor()
     cursor.execute("SELECT 1 FROM web_content WHERE url = ?", (url,))
     result = cursor.fetchone()
@@ -44,9 +85,9 @@ def is_url_scraped(url):
     return result is not None
 
 def save_scraped_data(url, text_content):
-    """Save the scraped text content to the database."""
+    """Save the scraped text content to the shard that owns its domain."""
     try:
-        conn = sqlite3.connect(SCRAPED_DB_PATH)
+        conn = sqlite3.connect(_url_shard_path(SCRAPED_DB_PATH, url), timeout=30)
         cursor = conn.cursor()
         cursor.execute(
             "INSERT OR IGNORE INTO web_content (url, text_content) VALUES (?, ?)",
@@ -71,4 +112,84 @@ def save_inaccessible_site(url, reason):
         conn.close()
         print(f"[Inaccessible] {url} - Reason: {reason}")
     except Exception as e:
-        print(f"[DB Error] Could not save inaccessible site {url}: {e}")
\ No newline at end of file
+        print(f"[DB Error] Could not save inaccessible site {url}: {e}")
+
+def get_scraped_pages(domain):
+    """Return (url, text_content) rows already scraped for a domain."""
+    conn = sqlite3.connect(domain_shard_path(SCRAPED_DB_PATH, domain))
+    cursor = conn.cursor()
+    rows = []
+    for scheme in ('http', 'https'):
+        # Prefix range on the url UNIQUE index instead of a leading-wildcard
+        # LIKE; it also matches longer hostnames, dropped by the netloc check
+        prefix = f"{scheme}://{domain}"
+        cursor.execute(
+            "SELECT url, text_content FROM web_content WHERE url >= ? AND url < ?",
+            (prefix, prefix + '\U0010ffff')
+        )
+        rows.extend((url, text) for url, text in cursor.fetchall() if urlparse(url).netloc == domain)
+    conn.close()
+    return rows
+
+def get_checkpointed_links():
+    """Return the set of links the orchestrator has already finalized."""
+    links = set()
+    for path in all_shard_paths(GROUPED_DB_PATH):
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT link FROM pipeline_checkpoint")
+        links.update(row[0] for row in cursor.fetchall())
+        conn.close()
+    return links
+
+def is_domain_grouped(domain):
+    """Check if a domain already has a row in the grouped database."""
+    conn = sqlite3.connect(domain_shard_path(GROUPED_DB_PATH, domain), timeout=30)
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM domain_data WHERE domain = ?", (domain,))
+    result = cursor.fetchone()
+    conn.close()
+    return result is not None
+
+def save_domain_group(domain, cleaned_pages, combined_text, links):
+    """
+    Store a finalized domain and checkpoint the links that produced it,
+    in the cleaned and grouped shards that own the domain.
+
+    The grouped row and the checkpoint are written in one transaction so a
+    crash never leaves a domain grouped but unrecorded, or the reverse.
+
+    Args:
+        domain (str): The domain being finalized.
+        cleaned_pages (list): (url, cleaned_text) rows for cleaned_data.
+        combined_text (str): Grouped and cleaned text for the domain.
+        links (list): Input links whose crawl produced this domain.
+    """
+    if cleaned_pages:
+        cleaned_conn = sqlite3.connect(domain_shard_path(CLEANED_DB_PATH, domain), timeout=30)
+        cleaned_conn.executemany(
+            "INSERT INTO cleaned_data (url, cleaned_text) VALUES (?, ?)",
+            cleaned_pages
+        )
+        cleaned_conn.commit()
+        cleaned_conn.close()
+
+    conn = sqlite3.connect(domain_shard_path(GROUPED_DB_PATH, domain), timeout=30)
+    cursor = conn.cursor()
+    if combined_text:
+        # A domain can be finalized again if a duplicate link reaches it later
+        cursor.execute(
+            "UPDATE domain_data SET combined_text = combined_text || ' ' || ? WHERE domain = ?",
+            (combined_text, domain)
+        )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                "INSERT INTO domain_data (domain, combined_text) VALUES (?, ?)",
+                (domain, combined_text)
+            )
+    cursor.executemany(
+        "INSERT OR REPLACE INTO pipeline_checkpoint (link, domain) VALUES (?, ?)",
+        [(link, domain) for link in links]
+    )
+    conn.commit()
+    conn.close()
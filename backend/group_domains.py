@@ -1,8 +1,12 @@
 import sqlite3
+import sys
 from urllib.parse import urlparse
 
-def group_by_domain():
-    conn = sqlite3.connect('backend/cleaned_data.db')
+from db_utils import CLEANED_DB_PATH, GROUPED_DB_PATH
+from shard_utils import shard_path, shards_from_args
+
+def group_by_domain(shard=0):
+    conn = sqlite3.connect(shard_path(CLEANED_DB_PATH, shard))
     cursor = conn.cursor()
     cursor.execute('SELECT url, cleaned_text FROM cleaned_data')
     rows = cursor.fetchall()
@@ -17,7 +21,7 @@ def group_by_domain():
         print("url print")
 
     # Store grouped data
-    conn_grouped = sqlite3.connect('backend/grouped_data.db')
+    conn_grouped = sqlite3.connect(shard_path(GROUPED_DB_PATH, shard))
     cursor_grouped = conn_grouped.cursor()
     cursor_grouped.execute('CREATE TABLE IF NOT EXISTS domain_data (domain TEXT, combined_text TEXT)')
 
@@ -29,4 +33,6 @@ def group_by_domain():
     conn.close()
 
 if __name__ == "__main__":
-    group_by_domain()  
\ No newline at end of file
+    # Pass a shard index to group one shard, e.g. one process per shard
+    for shard in shards_from_args(sys.argv):
+        group_by_domain(shard)  
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+NLTK_DATA_DIR = os.environ.get('ETL_NLTK_DATA', os.path.join(BASE_DIR, 'nltk_data'))
+
+# NLTK package name -> resource path checked by nltk.data.find()
+REQUIRED_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+}
+
+_nltk_lock = threading.Lock()
+_nltk_module = None
+
+def _load_nltk():
+    """Import nltk on first use and point it at the local resource cache."""
+    global _nltk_module
+    with _nltk_lock:
+        if _nltk_module is None:
+            import nltk
+            if NLTK_DATA_DIR not in nltk.data.path:
+                nltk.data.path.insert(0, NLTK_DATA_DIR)
+            _nltk_module = nltk
+    return _nltk_module
+
+def missing_resources():
+    """Return the names of required NLTK resources not found locally."""
+    nltk = _load_nltk()
+    from nltk.tokenize import punkt
+    missing = []
+    for name, resource_path in REQUIRED_RESOURCES.items():
+        # punkt_tab only exists on NLTK releases whose tokenizer reads it
+        if name == 'punkt_tab' and not hasattr(punkt, 'PunktTokenizer'):
+            continue
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+def bootstrap_resources():
+    """
+    Download the required NLTK resources into the local cache, once.
+
+    This is the only place that touches the network; run it at build or
+    deploy time so the app and ETL scripts can start offline.
+
+    Returns:
+        list: Names of resources that could not be installed.
+    """
+    nltk = _load_nltk()
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
+    failed = []
+    for name in missing_resources():
+        print(f"[NLTK] Downloading '{name}' into {NLTK_DATA_DIR}")
+        if not nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True):
+            failed.append(name)
+    return failed
+
+def _missing_resource_error(resource_name):
+    return LookupError(
+        f"NLTK resource '{resource_name}' is not installed. "
+        f"Run 'python backend/nltk_resources.py' once to build the local cache."
+    )
+
+@lru_cache(maxsize=1)
+def get_stop_words():
+    """Return the English stop words as a frozenset, loaded on first call."""
+    _load_nltk()
+    from nltk.corpus import stopwords
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        raise _missing_resource_error('stopwords') from None
+
+def tokenize(text):
+    """Tokenize text with NLTK's word tokenizer, loaded on first call."""
+    _load_nltk()
+    from nltk.tokenize import word_tokenize
+    try:
+        return word_tokenize(text)
+    except LookupError:
+        raise _missing_resource_error('punkt') from None
+
+if __name__ == "__main__":
+    failed = bootstrap_resources()
+    if failed:
+        print(f"[NLTK] Failed to install: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"[NLTK] All resources available in {NLTK_DATA_DIR}")
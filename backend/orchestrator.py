@@ -0,0 +1,308 @@
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from clean_grouped_db import clean_combined_text
+from crawler_utils import crawl_and_scrape, get_domain
+from db_utils import (
+    init_databases, init_etl_databases, get_checkpointed_links,
+    get_scraped_pages, is_domain_grouped, save_domain_group
+)
+from nltk_resources import missing_resources
+from pipeline import read_all_links
+from text_cleaning import clean_text
+
+# How often a blocked queue put re-checks whether the run was aborted
+PUT_POLL_SECONDS = 0.5
+
+class PipelineAborted(Exception):
+    """Raised inside crawler threads once the run has been aborted."""
+
+class PipelineProgress:
+    """Thread-safe counters shared by every stage, reported on one line."""
+
+    def __init__(self, total_links):
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.total_links = total_links
+        self.links_crawled = 0
+        self.pages_scraped = 0
+        self.pages_cleaned = 0
+        self.pages_failed = 0
+        self.domains_finalized = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def report(self, queued=0):
+        with self.lock:
+            elapsed = time.time() - self.start_time
+            print(
+                f"[Progress] {self.links_crawled}/{self.total_links} links crawled | "
+                f"{self.pages_scraped} pages scraped, {self.pages_cleaned} cleaned, "
+                f"{self.pages_failed} failed | "
+                f"{self.domains_finalized} domains finalized | "
+                f"{queued} queued | {elapsed:.0f}s"
+            )
+
+def _normalize_link(link):
+    """Key used to drop duplicate links that would crawl the same start page."""
+    link = link.strip().lower()
+    for prefix in ('https://', 'http://'):
+        if link.startswith(prefix):
+            link = link[len(prefix):]
+    return link.rstrip('/')
+
+def _put(page_queue, item, abort_event):
+    """Put into the bounded queue, giving up once the run is aborted."""
+    while True:
+        if abort_event.is_set():
+            raise PipelineAborted()
+        try:
+            page_queue.put(item, timeout=PUT_POLL_SECONDS)
+            return
+        except queue.Full:
+            continue
+
+def _crawl_link(link, depth, max_links, page_queue, claimed_domains, claimed_lock, progress, abort_event):
+    """
+    Crawl one link and stream its pages into the page queue.
+
+    Always finishes by putting a ('crawled', ...) event so the dispatcher
+    can count completed links, even if the crawl raised, unless the run
+    was aborted.
+    """
+    if abort_event.is_set():
+        return
+    state = {'domain': None, 'pages': 0}
+
+    def on_page(url, text):
+        domain = get_domain(url)
+        if state['domain'] is None:
+            state['domain'] = domain
+            with claimed_lock:
+                claimed_domains.add(domain)
+        state['pages'] += 1
+        progress.add(pages_scraped=1)
+        # Blocks while the queue is full, which throttles the crawl
+        _put(page_queue, ('page', domain, url, text), abort_event)
+
+    ok = True
+    try:
+        domain = crawl_and_scrape(link, depth, max_links, on_page=on_page, stop_event=abort_event)
+        state['domain'] = state['domain'] or domain
+
+        # Pages saved by an earlier or interrupted run are replayed once so
+        # the domain still gets grouped
+        if not state['pages'] and domain and not is_domain_grouped(domain):
+            with claimed_lock:
+                replay = domain not in claimed_domains
+                claimed_domains.add(domain)
+            if replay:
+                for url, text in get_scraped_pages(domain):
+                    _put(page_queue, ('page', domain, url, text), abort_event)
+    except PipelineAborted:
+        return
+    except Exception as exc:
+        print(f"[Error] {link} generated an exception: {exc}")
+        ok = False
+
+    progress.add(links_crawled=1)
+    try:
+        _put(page_queue, ('crawled', link, state['domain'], ok), abort_event)
+    except PipelineAborted:
+        pass
+
+def _finalize_domains(clean_queue, in_flight, progress):
+    """
+    Collect cleaned pages per domain and group and finalize each domain
+    once its crawl is complete. Runs as the single writer for the cleaned
+    and grouped databases.
+
+    A link is only checkpointed when its domain has grouped data and none
+    of its pages failed to clean, so sites that were down or hit a cleaning
+    error are retried by the next run.
+    """
+    domain_pages = {}
+    failed_domains = set()
+    while True:
+        event = clean_queue.get()
+        if event is None:
+            break
+
+        if event[0] == 'page':
+            _, domain, url, future = event
+            try:
+                domain_pages.setdefault(domain, []).append((url, future.result()))
+                progress.add(pages_cleaned=1)
+            except Exception as exc:
+                print(f"[Error] Cleaning {url} failed: {exc}")
+                failed_domains.add(domain)
+                progress.add(pages_failed=1)
+            finally:
+                in_flight.release()
+            continue
+
+        _, link, domain, ok = event
+        if domain is None:
+            continue
+        pages = domain_pages.pop(domain, [])
+        if domain in failed_domains:
+            # Drop the partial domain; it is replayed from scraped data next run
+            failed_domains.discard(domain)
+            print(f"[Error] {domain} not finalized: some pages failed to clean.")
+            continue
+        try:
+            if not pages and not is_domain_grouped(domain):
+                # Nothing was scraped, e.g. the site was down; retry next run
+                continue
+            combined_text = clean_combined_text(' '.join(text for _, text in pages))
+            save_domain_group(domain, pages, combined_text, [link] if ok else [])
+            progress.add(domains_finalized=1)
+        except Exception as exc:
+            print(f"[DB Error] Could not finalize {domain}: {exc}")
+
+def _report_progress(progress, page_queue, stop_event, interval):
+    while not stop_event.wait(interval):
+        progress.report(page_queue.qsize())
+
+def run_pipeline(links, depth=1, max_links=20, crawl_workers=5, clean_workers=None,
+                 queue_size=200, report_interval=10):
+    """
+    Crawl, clean, group and finalize links as one overlapping pipeline.
+
+    Crawler threads stream pages into a bounded queue, a process pool cleans
+    them while crawling continues, and each domain is grouped and finalized
+    as soon as its crawl completes. Finalized links are checkpointed so an
+    interrupted run resumes where it stopped.
+
+    Args:
+        links (list): List of URLs to crawl.
+        depth (int): Crawling depth.
+        max_links (int): Maximum number of pages to scrape per domain.
+        crawl_workers (int): Number of parallel crawler threads.
+        clean_workers (int): Number of cleaning processes (default: CPU count).
+        queue_size (int): Maximum pages waiting between crawling and cleaning.
+            The cleaning pool holds up to as many again, so at most about
+            2 * queue_size pages are in memory at once.
+        report_interval (int): Seconds between progress reports.
+    """
+    seen = {_normalize_link(link) for link in get_checkpointed_links()}
+    pending_links = []
+    for link in links:
+        key = _normalize_link(link)
+        if key in seen:
+            continue
+        seen.add(key)
+        pending_links.append(link)
+
+    skipped = len(links) - len(pending_links)
+    if skipped:
+        print(f"Skipping {skipped} links already finalized or duplicated.")
+    if not pending_links:
+        print("Nothing left to process.")
+        return
+
+    progress = PipelineProgress(len(pending_links))
+    page_queue = queue.Queue(maxsize=queue_size)
+    clean_queue = queue.Queue()
+    in_flight = threading.BoundedSemaphore(queue_size)
+    claimed_domains = set()
+    claimed_lock = threading.Lock()
+    stop_event = threading.Event()
+    abort_event = threading.Event()
+
+    reporter = threading.Thread(
+        target=_report_progress, args=(progress, page_queue, stop_event, report_interval), daemon=True
+    )
+    finalizer = threading.Thread(target=_finalize_domains, args=(clean_queue, in_flight, progress))
+
+    # spawn keeps the cleaning workers from forking a process that holds crawler locks
+    mp_context = multiprocessing.get_context('spawn')
+    clean_pool = ProcessPoolExecutor(max_workers=clean_workers, mp_context=mp_context)
+    crawl_pool = ThreadPoolExecutor(max_workers=crawl_workers)
+    finalizer.start()
+    reporter.start()
+    try:
+        for link in pending_links:
+            crawl_pool.submit(
+                _crawl_link, link, depth, max_links, page_queue,
+                claimed_domains, claimed_lock, progress, abort_event
+            )
+
+        # Dispatch pages to the cleaning pool until every link has reported
+        remaining = len(pending_links)
+        while remaining:
+            event = page_queue.get()
+            if event[0] == 'page':
+                _, domain, url, text = event
+                in_flight.acquire()
+                clean_queue.put(('page', domain, url, clean_pool.submit(clean_text, text)))
+            else:
+                clean_queue.put(event)
+                remaining -= 1
+    except BaseException:
+        # Ctrl-C or a dispatcher error: stop crawlers and pending cleaning,
+        # but still finalize the domains that completed so a re-run resumes
+        print("\n[Pipeline] Aborting; finalizing completed domains before exit...")
+        abort_event.set()
+        clean_pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        crawl_pool.shutdown(wait=True, cancel_futures=True)
+        clean_queue.put(None)
+        finalizer.join()
+        clean_pool.shutdown(wait=True, cancel_futures=True)
+        stop_event.set()
+        progress.report()
+
+def main():
+    """
+    Main function to execute the full crawl-to-grouped-data pipeline.
+    """
+    # Paths
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    csv_file = os.path.join(os.path.dirname(script_dir), '..', 'data', 'companies-12-2-2024 (1).csv')
+
+    # Parameters
+    column_name = 'Website'
+    depth = 1
+    max_links_per_domain = 20
+    crawl_workers = 5  # Number of parallel crawler threads
+    queue_size = 200  # Pages buffered between crawling and cleaning
+
+    # Cleaning needs the local NLTK cache; without it every page would fail
+    missing = missing_resources()
+    if missing:
+        print(f"Missing NLTK resources: {', '.join(missing)}. "
+              f"Run 'python backend/nltk_resources.py' once to build the local cache.")
+        sys.exit(1)
+
+    print(f"Reading all links from '{csv_file}'...")
+    links = read_all_links(csv_file, column_name)
+
+    if not links:
+        print("No links found to process.")
+        return
+
+    print(f"Starting pipeline for {len(links)} links with depth={depth} and max_links={max_links_per_domain} per link.")
+    start_time = time.time()
+
+    run_pipeline(
+        links, depth=depth, max_links=max_links_per_domain,
+        crawl_workers=crawl_workers, queue_size=queue_size
+    )
+
+    elapsed = time.time() - start_time
+    print(f"\nPipeline completed in {elapsed:.2f} seconds.")
+
+if __name__ == "__main__":
+    init_databases()
+    init_etl_databases()
+    main()
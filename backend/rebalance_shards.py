@@ -0,0 +1,168 @@
+import os
+import sqlite3
+import sys
+from urllib.parse import urlparse
+
+from db_utils import (
+    SCRAPED_DB_PATH, CLEANED_DB_PATH, GROUPED_DB_PATH,
+    create_scraped_tables, create_cleaned_tables, create_grouped_tables
+)
+from shard_utils import read_manifest, set_shard_count, shard_for_domain, shard_path, write_manifest
+
+BATCH_SIZE = 500
+
+# database -> (table creator, [(table, columns copied, column holding the domain key)])
+# AUTOINCREMENT ids are not copied; every shard numbers its own rows.
+SHARDED_DATABASES = {
+    SCRAPED_DB_PATH: (create_scraped_tables, [
+        ('web_content', ['url', 'text_content'], 'url'),
+    ]),
+    CLEANED_DB_PATH: (create_cleaned_tables, [
+        ('cleaned_data', ['url', 'cleaned_text'], 'url'),
+    ]),
+    GROUPED_DB_PATH: (create_grouped_tables, [
+        ('domain_data', ['domain', 'combined_text'], 'domain'),
+        ('pipeline_checkpoint', ['link', 'domain'], 'domain'),
+    ]),
+}
+
+def _row_domain(value, key_column):
+    return urlparse(value).netloc if key_column == 'url' else value
+
+def _layout(db_path, old_count, new_count):
+    """Return the old shard paths, new shard paths and temp paths of one database."""
+    old_paths = [shard_path(db_path, shard, old_count) for shard in range(old_count)]
+    new_paths = [shard_path(db_path, shard, new_count) for shard in range(new_count)]
+    temp_paths = [path + '.rebalance' for path in new_paths]
+    return old_paths, new_paths, temp_paths
+
+def build_rebalanced_database(db_path, old_count, new_count):
+    """
+    Copy one database from old_count shards into temporary new_count shard files.
+
+    The old shard files are only read, so an interruption here leaves the
+    current layout untouched and a re-run simply rebuilds the temp files.
+
+    Returns:
+        int: Number of rows copied.
+    """
+    create_tables, tables = SHARDED_DATABASES[db_path]
+    old_paths, new_paths, temp_paths = _layout(db_path, old_count, new_count)
+
+    # Files of the new layout next to missing old shards mean the manifest
+    # does not describe what is on disk; copying would lose data
+    missing = [path for path in old_paths if not os.path.exists(path)]
+    stray = [path for path in new_paths if path not in old_paths and os.path.exists(path)]
+    if missing and stray:
+        raise RuntimeError(
+            f"{os.path.basename(db_path)}: shards {', '.join(map(os.path.basename, missing))} "
+            f"are missing but {', '.join(map(os.path.basename, stray))} exist; "
+            f"shards.json does not match the files on disk."
+        )
+
+    new_conns = []
+    for temp_path in temp_paths:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        conn = sqlite3.connect(temp_path)
+        create_tables(conn)
+        new_conns.append(conn)
+
+    copied = 0
+    for old_path in old_paths:
+        if not os.path.exists(old_path):
+            continue
+        old_conn = sqlite3.connect(old_path)
+        for table, columns, key_column in tables:
+            try:
+                cursor = old_conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+            except sqlite3.OperationalError:
+                # Table was never created in this shard
+                continue
+            key_index = columns.index(key_column)
+            insert = (
+                f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})"
+            )
+            while True:
+                rows = cursor.fetchmany(BATCH_SIZE)
+                if not rows:
+                    break
+                batches = [[] for _ in range(new_count)]
+                for row in rows:
+                    domain = _row_domain(row[key_index] or '', key_column)
+                    batches[shard_for_domain(domain, new_count)].append(row)
+                for conn, batch in zip(new_conns, batches):
+                    if batch:
+                        conn.executemany(insert, batch)
+                copied += len(rows)
+        old_conn.close()
+
+    for conn in new_conns:
+        conn.commit()
+        conn.close()
+    return copied
+
+def swap_rebalanced_database(db_path, old_count, new_count):
+    """
+    Move the temp files of one database into place and drop unused old shards.
+
+    Safe to repeat: temp files already moved are skipped, and old shards
+    are only removed once every new shard file is in place.
+    """
+    old_paths, new_paths, temp_paths = _layout(db_path, old_count, new_count)
+    for temp_path, new_path in zip(temp_paths, new_paths):
+        if os.path.exists(temp_path):
+            os.replace(temp_path, new_path)
+    if not all(os.path.exists(path) for path in new_paths):
+        raise RuntimeError(f"{os.path.basename(db_path)}: new shard files are missing; not removing old shards.")
+    for old_path in old_paths:
+        if old_path not in new_paths and os.path.exists(old_path):
+            os.remove(old_path)
+
+def _swap_all(old_count, new_count):
+    for db_path in SHARDED_DATABASES:
+        swap_rebalanced_database(db_path, old_count, new_count)
+    set_shard_count(new_count)
+
+def rebalance(new_count):
+    """
+    Change the number of shards of the scraped, cleaned and grouped databases.
+
+    Temp files for all three databases are built before anything is moved.
+    The manifest then records the swap as in progress, so an interrupted
+    swap is finished by the next run instead of copying from shards that
+    were already replaced.
+
+    Stop the crawler, the ETL scripts and the Flask app first; they read the
+    shard count once at startup.
+    """
+    manifest = read_manifest()
+    in_progress = manifest.get('rebalance_in_progress')
+    if in_progress:
+        print(f"Finishing interrupted rebalance from {in_progress['from']} to {in_progress['to']} shard(s)...")
+        _swap_all(in_progress['from'], in_progress['to'])
+        manifest = read_manifest()
+
+    old_count = int(manifest['shard_count'])
+    if new_count == old_count:
+        print(f"Corpus has {old_count} shard(s).")
+        return
+
+    print(f"Rebalancing from {old_count} to {new_count} shard(s)...")
+    for db_path in SHARDED_DATABASES:
+        copied = build_rebalanced_database(db_path, old_count, new_count)
+        print(f"[Rebalance] {os.path.basename(db_path)}: {copied} rows redistributed.")
+
+    write_manifest({
+        'shard_count': old_count,
+        'rebalance_in_progress': {'from': old_count, 'to': new_count},
+    })
+    _swap_all(old_count, new_count)
+    print("Rebalancing completed.")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or not sys.argv[1].isdigit() or int(sys.argv[1]) < 1:
+        print("Usage: python backend/rebalance_shards.py <shard_count>")
+        sys.exit(1)
+    rebalance(int(sys.argv[1]))
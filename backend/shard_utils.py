@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import threading
+import zlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BASE_DIR, 'shards.json')
+
+_shard_count = None
+_shard_count_lock = threading.Lock()
+
+def read_manifest():
+    """Return the contents of shards.json, or the single-shard default without one."""
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'shard_count': 1}
+
+def write_manifest(manifest):
+    """Atomically replace shards.json with the given contents."""
+    global _shard_count
+    with _shard_count_lock:
+        temp_path = MANIFEST_PATH + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, MANIFEST_PATH)
+        _shard_count = None
+
+def get_shard_count():
+    """
+    Return the number of shards the corpus is split into.
+
+    Read once from shards.json (written by rebalance_shards.py); without a
+    manifest the corpus is a single unsharded file per database.
+    """
+    global _shard_count
+    with _shard_count_lock:
+        if _shard_count is None:
+            manifest = read_manifest()
+            if 'rebalance_in_progress' in manifest:
+                raise RuntimeError(
+                    "A shard rebalance was interrupted. "
+                    "Run 'python backend/rebalance_shards.py <shard_count>' to finish it."
+                )
+            _shard_count = int(manifest['shard_count'])
+    return _shard_count
+
+def set_shard_count(shard_count):
+    """Record a new shard count in the manifest."""
+    write_manifest({'shard_count': shard_count})
+
+def shard_for_domain(domain, shard_count=None):
+    """Map a domain to its shard index with a hash that is stable across runs."""
+    shard_count = shard_count or get_shard_count()
+    return zlib.crc32(domain.lower().encode('utf-8')) % shard_count
+
+def shard_path(db_path, shard, shard_count=None):
+    """
+    Return the file holding one shard of a database.
+
+    With a single shard this is db_path itself, so unsharded trees keep
+    their original file names.
+    """
+    shard_count = shard_count or get_shard_count()
+    if shard_count == 1:
+        return db_path
+    root, ext = os.path.splitext(db_path)
+    return f"{root}_shard{shard}{ext}"
+
+def all_shard_paths(db_path, shard_count=None):
+    """Return every shard file of a database, in shard order."""
+    shard_count = shard_count or get_shard_count()
+    return [shard_path(db_path, shard, shard_count) for shard in range(shard_count)]
+
+def domain_shard_path(db_path, domain):
+    """Return the shard file of a database that owns the given domain."""
+    return shard_path(db_path, shard_for_domain(domain))
+
+def shards_from_args(argv):
+    """
+    Return the shard indexes an ETL script should process.
+
+    With no argument every shard is processed; with one, only that shard.
+    Prints a usage message and exits on anything else, so a bad index never
+    falls back to the whole corpus or creates a stray shard file.
+    """
+    shard_count = get_shard_count()
+    if len(argv) == 1:
+        return list(range(shard_count))
+    if len(argv) == 2 and argv[1].isdigit() and int(argv[1]) < shard_count:
+        return [int(argv[1])]
+    script = os.path.basename(argv[0])
+    print(f"Usage: python backend/{script} [shard]")
+    print(f"  shard must be between 0 and {shard_count - 1} (corpus has {shard_count} shard(s)).")
+    sys.exit(1)
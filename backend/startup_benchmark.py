@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BASE_DIR)
+
+# Cold-start budget in seconds for importing each entry point in a fresh
+# interpreter. Importing must not touch the network or load pandas,
+# scikit-learn or NLTK; those are paid on first use instead.
+COLD_START_TARGETS = {
+    'app': 1.0,
+    'pipeline': 0.5,
+    'orchestrator': 0.5,
+    'text_cleaning': 0.5,
+    'group_domains': 0.5,
+    'clean_grouped_db': 0.5,
+    'rebalance_shards': 0.5,
+}
+
+HEAVY_MODULES = ('pandas', 'numpy', 'sklearn', 'nltk')
+
+MEASURE_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ','.join(heavy))
+"""
+
+def measure_import(module, cwd, runs=5):
+    """
+    Import a module in fresh interpreters and report the fastest run.
+
+    Args:
+        module (str): Module name to import.
+        cwd (str): Directory the module is importable from.
+        runs (int): Number of fresh interpreters to start.
+
+    Returns:
+        tuple: (best import time in seconds, list of heavy modules loaded).
+    """
+    best = None
+    heavy = []
+    code = MEASURE_SNIPPET.format(module=module, heavy=HEAVY_MODULES)
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=cwd, capture_output=True, text=True, check=True
+        )
+        elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(' ')
+        elapsed = float(elapsed)
+        heavy = [name for name in loaded.split(',') if name]
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, heavy
+
+def main():
+    """Check every entry point against its cold-start target."""
+    failures = 0
+    for module, target in COLD_START_TARGETS.items():
+        cwd = PROJECT_DIR if module == 'app' else BASE_DIR
+        try:
+            elapsed, heavy = measure_import(module, cwd)
+        except subprocess.CalledProcessError as e:
+            print(f"[FAIL] {module}: import failed\n{e.stderr}")
+            failures += 1
+            continue
+
+        status = 'OK' if elapsed <= target and not heavy else 'FAIL'
+        if status == 'FAIL':
+            failures += 1
+        print(f"[{status}] {module}: {elapsed:.3f}s (target {target:.2f}s)")
+        if heavy:
+            print(f"       eagerly imported: {', '.join(heavy)}")
+
+    if failures:
+        print(f"\n{failures} entry point(s) over their cold-start budget.")
+        sys.exit(1)
+    print("\nAll entry points within their cold-start budget.")
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,17 @@
 import re
 import sqlite3
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import nltk
-nltk.download('stopwords')
-nltk.download('punkt')
+from db_utils import SCRAPED_DB_PATH, CLEANED_DB_PATH
+from nltk_resources import get_stop_words, tokenize
+from shard_utils import shard_path, shards_from_args
 
 def clean_text(text):
-    stop_words = set(stopwords.words('english'))
+    stop_words = get_stop_words()
     text = re.sub(r'\W', ' ', text)
     text = re.sub(r'\s+', ' ', text)
-    words = word_tokenize(text.lower())
+    words = tokenize(text.lower())
     cleaned_text = ' '.join([word for word in words if word not in stop_words])
     return cleaned_text
 
@@ -21,9 +20,9 @@ def process_row(row):
     cleaned_text = clean_text(text)
     return (url, cleaned_text)
 
-def store_cleaned_data():
-    # Connect to the original database to read the raw data
-    conn = sqlite3.connect('backend/scraped_data.db')
+def store_cleaned_data(shard=0):
+    # Connect to the original database shard to read the raw data
+    conn = sqlite3.connect(shard_path(SCRAPED_DB_PATH, shard))
     cursor = conn.cursor()
     
     # Read data from the web_content table
@@ -31,8 +30,8 @@ def store_cleaned_data():
     rows = cursor.fetchall()
     conn.close()
     
-    # Connect to the new database to store the cleaned data
-    conn_cleaned = sqlite3.connect('backend/cleaned_data.db')
+    # Connect to the matching cleaned shard to store the cleaned data
+    conn_cleaned = sqlite3.connect(shard_path(CLEANED_DB_PATH, shard))
     cursor_cleaned = conn_cleaned.cursor()
     
     cursor_cleaned.execute('CREATE TABLE IF NOT EXISTS cleaned_data (url TEXT, cleaned_text TEXT)')
@@ -52,4 +51,6 @@ def store_cleaned_data():
     conn_cleaned.close()
 
 if __name__ == "__main__":
-    store_cleaned_data()
\ No newline at end of file
+    # Pass a shard index to clean one shard, e.g. one process per shard
+    for shard in shards_from_args(sys.argv):
+        store_cleaned_data(shard)
\ No newline at end of file